@@ -9,6 +9,17 @@ import plotly.graph_objects as go
 import random
 import subprocess
 import sys
+import os
+import tempfile
+import shutil
+import atexit
+from pathlib import Path
+import uuid
+import sqlite3
+import queue
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 
 # Install missing packages if needed
 try:
@@ -302,12 +313,6 @@ def generate_supplier_data():
     return pd.DataFrame(data)
 
 # Initialize session state
-if 'sales_data' not in st.session_state:
-    st.session_state.sales_data = generate_sales_data()
-    
-if 'supplier_data' not in st.session_state:
-    st.session_state.supplier_data = generate_supplier_data()
-    
 if 'financial_calendar' not in st.session_state:
     st.session_state.financial_calendar = generate_financial_calendar(datetime.date.today().year)
     
@@ -340,6 +345,539 @@ def simulate_payments():
     
     st.session_state.last_update = datetime.datetime.now()
 
+# Export settings
+EXPORT_CHUNK_ROWS = 100_000
+EXCEL_MAX_ROWS = 1_048_575  # Excel sheet limit, minus the header row
+EXCEL_SHEETS_PER_PART = 2  # at ~30 bytes a row, a full part is ~60 MB
+# Exports live under the app's static folder, so Streamlit's static file
+# server (server.enableStaticServing) streams them from disk for download
+EXPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "exports")
+EXPORT_URL = "app/static/exports"
+EXPORT_MAX_AGE_HOURS = 24
+# The static file server answers 404 for files over 200 MB, so exports are
+# split into numbered parts that stay under it
+STATIC_FILE_LIMIT_BYTES = 200 * 1024 * 1024
+EXPORT_PART_MAX_BYTES = 190 * 1024 * 1024
+
+# Remove export files older than the max age; nothing else deletes them when a session ends
+def sweep_export_dir():
+    if not os.path.isdir(EXPORT_DIR):
+        return
+    cutoff = time.time() - EXPORT_MAX_AGE_HOURS * 3600
+    for entry in os.scandir(EXPORT_DIR):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+
+# Shared export worker pool, so long exports don't block other sessions' reruns
+@st.cache_resource
+def get_export_executor():
+    sweep_export_dir()
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="clearvue-export")
+
+# Yield a frame in fixed-size chunks, filtering each chunk on its own
+def iter_export_chunks(data, regions=None, categories=None, progress=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    total = len(data)
+    for start in range(0, total, chunk_rows):
+        chunk = data.iloc[start:start + chunk_rows]
+        if regions is not None:
+            chunk = chunk[chunk['Region'].isin(regions)]
+        if categories is not None:
+            chunk = chunk[chunk['Category'].isin(categories)]
+        if not chunk.empty:
+            yield chunk
+        if progress is not None:
+            progress(min(start + chunk_rows, total) / total)
+
+# Each writer streams chunks into numbered part files named by part_path(n),
+# starting a new part before one would grow past EXPORT_PART_MAX_BYTES.
+# template is an empty frame with the export's columns and dtypes.
+
+# Stream chunks into CSV parts, each starting with the header
+def write_csv_chunks(chunks, part_path, template):
+    header = template.to_csv(index=False).encode('utf-8')
+    f = None
+    parts = 0
+    try:
+        for chunk in chunks:
+            data = chunk.to_csv(index=False, header=False).encode('utf-8')
+            if f is None or f.tell() + len(data) > EXPORT_PART_MAX_BYTES:
+                if f is not None:
+                    f.close()
+                parts += 1
+                f = open(part_path(parts), 'wb')
+                f.write(header)
+            f.write(data)
+        if f is None:
+            f = open(part_path(1), 'wb')
+            f.write(header)
+    finally:
+        if f is not None:
+            f.close()
+
+# Arrow schema for the template, with empty text columns typed as strings
+def parquet_schema(template):
+    import pyarrow as pa
+
+    schema = pa.Schema.from_pandas(template, preserve_index=False)
+    return pa.schema(
+        [field.with_type(pa.string()) if pa.types.is_null(field.type) else field for field in schema],
+        metadata=schema.metadata
+    )
+
+# Stream chunks into Parquet parts, one row group per chunk
+def write_parquet_chunks(chunks, part_path, template):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = parquet_schema(template)
+    sink = writer = None
+    parts = 0
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+            if writer is None or sink.tell() + table.nbytes > EXPORT_PART_MAX_BYTES:
+                if writer is not None:
+                    writer.close()
+                    sink.close()
+                parts += 1
+                sink = pa.OSFile(part_path(parts), 'wb')
+                writer = pq.ParquetWriter(sink, schema)
+            writer.write_table(table)
+        if writer is None:
+            pq.write_table(schema.empty_table(), part_path(1))
+    finally:
+        if writer is not None:
+            writer.close()
+            sink.close()
+
+# Stream chunks into Excel parts, rolling over to a new sheet when one fills
+# up and to a new workbook every EXCEL_SHEETS_PER_PART sheets
+def write_excel_chunks(chunks, part_path, template):
+    from openpyxl import Workbook
+
+    columns = list(template.columns)
+    workbook = sheet = None
+    sheet_rows = 0
+    parts = 0
+    for chunk in chunks:
+        for row in chunk.itertuples(index=False, name=None):
+            if sheet is None or sheet_rows >= EXCEL_MAX_ROWS:
+                if workbook is not None and len(workbook.worksheets) >= EXCEL_SHEETS_PER_PART:
+                    workbook.save(part_path(parts))
+                    workbook = None
+                if workbook is None:
+                    workbook = Workbook(write_only=True)
+                    parts += 1
+                sheet = workbook.create_sheet(f"Export {len(workbook.worksheets) + 1}")
+                sheet.append(columns)
+                sheet_rows = 0
+            sheet.append(row)
+            sheet_rows += 1
+
+    if workbook is None:
+        workbook = Workbook(write_only=True)
+        workbook.create_sheet("Export 1").append(columns)
+        parts = 1
+    workbook.save(part_path(parts))
+
+EXPORT_FORMATS = {
+    "CSV": (".csv", write_csv_chunks),
+    "Parquet": (".parquet", write_parquet_chunks),
+    "Excel": (".xlsx", write_excel_chunks),
+}
+
+# Run an export job on the worker pool (no Streamlit calls in here)
+def run_export(job, make_chunks, template):
+    extension, writer = EXPORT_FORMATS[job['format']]
+    stem = job['stored_name'][:-len(extension)]
+    created = []
+
+    def part_path(number):
+        path = os.path.join(EXPORT_DIR, f"{stem}_part{number}{extension}")
+        created.append(path)
+        return path
+
+    def set_progress(fraction):
+        job['progress'] = fraction
+
+    def count_rows(chunks):
+        for chunk in chunks:
+            yield chunk
+            job['rows_written'] += len(chunk)
+
+    job['status'] = 'running'
+    try:
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        writer(count_rows(make_chunks(set_progress)), part_path, template)
+        # A single part keeps the plain file name
+        if len(created) == 1:
+            single = os.path.join(EXPORT_DIR, job['stored_name'])
+            os.replace(created[0], single)
+            created[0] = single
+        job['parts'] = created
+        job['progress'] = 1.0
+        job['status'] = 'done'
+    except Exception as e:
+        job['status'] = 'failed'
+        job['error'] = str(e)
+        for path in created:
+            if os.path.exists(path):
+                os.remove(path)
+
+# Queue an export and return its job record; make_chunks(progress) yields the
+# rows and template is an empty frame with their columns and dtypes
+def start_export(make_chunks, template, export_format, name):
+    # Drop this session's previous export files before starting a new one
+    previous = st.session_state.get('export_job')
+    if previous and previous['status'] in ('done', 'failed'):
+        for path in previous['parts']:
+            if os.path.exists(path):
+                os.remove(path)
+
+    sweep_export_dir()
+    extension = EXPORT_FORMATS[export_format][0]
+    file_name = f"clearvue_{name}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}{extension}"
+    job = {
+        'format': export_format,
+        'file_name': file_name,
+        'stored_name': f"{uuid.uuid4().hex}_{file_name}",
+        'parts': [],
+        'status': 'queued',
+        'progress': 0.0,
+        'rows_written': 0,
+        'error': None,
+    }
+    get_export_executor().submit(run_export, job, make_chunks, template.iloc[0:0])
+    return job
+
+# Show the current export job, with a download link per part once it finishes
+def show_export_job(job):
+    if job['status'] == 'failed':
+        st.error(f"Export failed: {job['error']}")
+    elif job['status'] == 'done':
+        try:
+            sizes = [os.path.getsize(path) for path in job['parts']]
+        except FileNotFoundError:
+            st.warning("This export has expired, please export again")
+            return
+        parts_note = f" in {len(sizes)} parts" if len(sizes) > 1 else ""
+        st.success(f"Exported {job['rows_written']:,} rows ({sum(sizes) / (1024 * 1024):,.1f} MB{parts_note})")
+        if not st.get_option("server.enableStaticServing"):
+            st.warning("Enable server.enableStaticServing to download exports")
+            return
+        # Plain links, so files are streamed from disk and never loaded into the session
+        for path, size in zip(job['parts'], sizes):
+            stored_name = os.path.basename(path)
+            download_name = stored_name.split('_', 1)[1]
+            if size > STATIC_FILE_LIMIT_BYTES:
+                st.error(f"{download_name} is over the 200 MB download limit, please narrow the filters")
+                continue
+            st.markdown(
+                f'<a href="{EXPORT_URL}/{stored_name}" download="{download_name}">'
+                f'⬇ Download {download_name} ({size / (1024 * 1024):,.1f} MB)</a>',
+                unsafe_allow_html=True
+            )
+    else:
+        st.progress(job['progress'], text=f"Exporting... {job['rows_written']:,} rows written")
+
+# Poll a running export without rerunning the whole dashboard
+@st.fragment(run_every=1)
+def poll_export_job():
+    job = st.session_state.export_job
+    if job['status'] in ('done', 'failed'):
+        st.rerun()
+    show_export_job(job)
+
+# Storage backends for the sales and supplier queries
+SALES_COLUMNS = ['Date', 'Region', 'Category', 'Subcategory', 'Revenue', 'Units']
+# Empty sales frame with the export dtypes, shared by both backends
+SALES_TEMPLATE = pd.DataFrame({
+    'Date': pd.Series(dtype='object'),
+    'Region': pd.Series(dtype='object'),
+    'Category': pd.Series(dtype='object'),
+    'Subcategory': pd.Series(dtype='object'),
+    'Revenue': pd.Series(dtype='float64'),
+    'Units': pd.Series(dtype='int64')
+})
+SUPPLIER_COLUMNS = ['Supplier', 'Category', 'Performance', 'Delivery Time (days)', 'Defect Rate (%)', 'Spend (USD)']
+PERIOD_COLUMNS = {
+    "Daily": 'Date',
+    "Weekly": 'Week',
+    "Monthly": 'Month',
+    "Quarterly": 'Period',
+    "Annual": 'Year'
+}
+STORAGE_BACKEND = os.environ.get("CLEARVUE_BACKEND", "pandas")
+# A warehouse extract to query read-only; unset means a generated demo database
+SQLITE_PATH = os.environ.get("CLEARVUE_SQLITE_PATH")
+SQLITE_POOL_SIZE = int(os.environ.get("CLEARVUE_SQLITE_POOL_SIZE", "4"))
+SQLITE_POOL_TIMEOUT = 30  # seconds to wait for a free pooled connection
+
+# In-memory pandas backend over one session's generated frames
+class PandasBackend:
+    def __init__(self, sales_data, supplier_data):
+        self.sales_data = sales_data
+        self.supplier_data = supplier_data
+
+    def _filtered_sales(self, regions, categories):
+        return self.sales_data[
+            (self.sales_data['Region'].isin(regions)) &
+            (self.sales_data['Category'].isin(categories))
+        ]
+
+    def sales_by_period(self, report_period, regions, categories):
+        filtered_data = self._filtered_sales(regions, categories)
+        dates = pd.to_datetime(filtered_data['Date'])
+        if report_period == "Daily":
+            keys = [filtered_data['Date']]
+        elif report_period == "Weekly":
+            keys = [dates.dt.strftime('%Y-%U').rename('Week')]
+        elif report_period == "Monthly":
+            keys = [dates.dt.strftime('%Y-%m').rename('Month')]
+        elif report_period == "Quarterly":
+            keys = [dates.dt.year.rename('Year'), dates.dt.quarter.rename('Quarter')]
+        else:  # Annual
+            keys = [dates.dt.year.rename('Year')]
+
+        period_data = filtered_data.groupby(keys).agg({'Revenue':'sum', 'Units':'sum'}).reset_index()
+        if report_period == "Quarterly":
+            period_data['Period'] = period_data['Year'].astype(str) + '-Q' + period_data['Quarter'].astype(str)
+        return period_data
+
+    def sales_by(self, column, regions, categories):
+        filtered_data = self._filtered_sales(regions, categories)
+        return filtered_data.groupby(column).agg({'Revenue':'sum', 'Units':'sum'}).reset_index()
+
+    def iter_sales_chunks(self, regions, categories, progress=None, chunk_rows=EXPORT_CHUNK_ROWS):
+        return iter_export_chunks(self.sales_data, regions, categories, progress, chunk_rows)
+
+    def supplier_spend(self):
+        return self.supplier_data.sort_values('Spend (USD)', ascending=False)
+
+    def supplier_delivery_times(self):
+        return self.supplier_data[['Category', 'Delivery Time (days)']]
+
+    def supplier_metrics(self):
+        return self.supplier_data[
+            ['Supplier', 'Category', 'Delivery Time (days)', 'Defect Rate (%)', 'Performance']
+        ].sort_values('Performance')
+
+    def supplier_defect_rates(self):
+        return self.supplier_data.groupby('Category')['Defect Rate (%)'].mean().reset_index()
+
+# Embedded SQLite backend; filters, period bucketing and group-bys run as SQL
+# over indexed tables and only result sets come back into pandas
+class SQLiteBackend:
+    # Bucket expressions per report period, matching the pandas backend's output
+    PERIOD_SQL = {
+        "Daily": [('"Date"', 'Date')],
+        "Weekly": [(
+            "printf('%s-%02d', strftime('%Y', \"Date\"), "
+            "(CAST(strftime('%j', \"Date\") AS INTEGER) + 6 - CAST(strftime('%w', \"Date\") AS INTEGER)) / 7)",
+            'Week'
+        )],
+        "Monthly": [("strftime('%Y-%m', \"Date\")", 'Month')],
+        "Quarterly": [
+            ("CAST(strftime('%Y', \"Date\") AS INTEGER)", 'Year'),
+            ("(CAST(strftime('%m', \"Date\") AS INTEGER) + 2) / 3", 'Quarter')
+        ],
+        "Annual": [("CAST(strftime('%Y', \"Date\") AS INTEGER)", 'Year')]
+    }
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sales (
+            "Date" TEXT NOT NULL,
+            "Region" TEXT NOT NULL,
+            "Category" TEXT NOT NULL,
+            "Subcategory" TEXT NOT NULL,
+            "Revenue" REAL NOT NULL,
+            "Units" INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS sales_filter_idx ON sales ("Region", "Category", "Date");
+        CREATE INDEX IF NOT EXISTS sales_date_idx ON sales ("Date");
+        CREATE TABLE IF NOT EXISTS suppliers (
+            "Supplier" TEXT NOT NULL,
+            "Category" TEXT NOT NULL,
+            "Performance" TEXT NOT NULL,
+            "Delivery Time (days)" INTEGER NOT NULL,
+            "Defect Rate (%)" REAL NOT NULL,
+            "Spend (USD)" INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS suppliers_category_idx ON suppliers ("Category");
+    """
+
+    # read_only opens an existing extract without ever writing to it; otherwise
+    # the database is set up (WAL mode, tables and indexes) for seeding
+    def __init__(self, path, pool_size=SQLITE_POOL_SIZE, pool_timeout=SQLITE_POOL_TIMEOUT, read_only=False):
+        self.path = path
+        self.pool_size = pool_size
+        self.pool_timeout = pool_timeout
+        self.read_only = read_only
+        self._pool = queue.Queue()
+        self._write_lock = threading.Lock()
+        for _ in range(pool_size):
+            # Pooled connections are handed between session and export threads
+            if read_only:
+                conn = sqlite3.connect(
+                    Path(path).resolve().as_uri() + "?mode=ro", uri=True, check_same_thread=False, timeout=30
+                )
+            else:
+                conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+                conn.execute("PRAGMA journal_mode=WAL")
+            self._pool.put(conn)
+        if read_only:
+            self._check_schema()
+        else:
+            with self.connection() as conn:
+                conn.executescript(self.SCHEMA)
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self._pool.get(timeout=self.pool_timeout)
+        except queue.Empty:
+            raise TimeoutError(
+                f"No SQLite connection free after {self.pool_timeout}s; "
+                f"raise CLEARVUE_SQLITE_POOL_SIZE (currently {self.pool_size})"
+            ) from None
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def _query(self, sql, params=()):
+        with self.connection() as conn:
+            return pd.read_sql_query(sql, conn, params=params)
+
+    def _sales_filter(self, regions, categories):
+        where = '"Region" IN ({}) AND "Category" IN ({})'.format(
+            ', '.join('?' * len(regions)), ', '.join('?' * len(categories))
+        )
+        return where, list(regions) + list(categories)
+
+    # Fail early if an extract lacks the tables or columns the dashboard queries
+    def _check_schema(self):
+        with self.connection() as conn:
+            for table, columns in (("sales", SALES_COLUMNS), ("suppliers", SUPPLIER_COLUMNS)):
+                found = {row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')}
+                missing = [c for c in columns if c not in found]
+                if missing:
+                    raise ValueError(f"{self.path}: table {table} is missing columns {missing}")
+
+    # Fill the demo database in one transaction; extracts are never written to
+    def seed(self, sales_data, supplier_data):
+        if self.read_only:
+            raise ValueError(f"{self.path} is opened read-only and can't be seeded")
+        with self._write_lock, self.connection() as conn:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO sales VALUES (?, ?, ?, ?, ?, ?)",
+                    sales_data[SALES_COLUMNS].itertuples(index=False, name=None)
+                )
+                conn.executemany(
+                    "INSERT INTO suppliers VALUES (?, ?, ?, ?, ?, ?)",
+                    supplier_data[SUPPLIER_COLUMNS].itertuples(index=False, name=None)
+                )
+            conn.execute("ANALYZE")
+
+    def sales_by_period(self, report_period, regions, categories):
+        buckets = self.PERIOD_SQL[report_period]
+        where, params = self._sales_filter(regions, categories)
+        keys = ', '.join(f'"{name}"' for _, name in buckets)
+        period_data = self._query(
+            'SELECT {}, SUM("Revenue") AS "Revenue", SUM("Units") AS "Units" '
+            'FROM sales WHERE {} GROUP BY {} ORDER BY {}'.format(
+                ', '.join(f'{expr} AS "{name}"' for expr, name in buckets), where, keys, keys
+            ),
+            params
+        )
+        if report_period == "Quarterly":
+            period_data['Period'] = period_data['Year'].astype(str) + '-Q' + period_data['Quarter'].astype(str)
+        return period_data
+
+    def sales_by(self, column, regions, categories):
+        where, params = self._sales_filter(regions, categories)
+        return self._query(
+            f'SELECT "{column}", SUM("Revenue") AS "Revenue", SUM("Units") AS "Units" '
+            f'FROM sales WHERE {where} GROUP BY "{column}" ORDER BY "{column}"',
+            params
+        )
+
+    # One export page after a rowid, taking (last_rowid, *filter params, limit).
+    # NOT INDEXED keeps each page a rowid seek plus a linear read, rather than
+    # re-sorting every filter match to find the next rowid
+    def _sales_page_sql(self, where):
+        return "SELECT rowid, {} FROM sales NOT INDEXED WHERE rowid > ? AND {} ORDER BY rowid LIMIT ?".format(
+            ', '.join(f'"{c}"' for c in SALES_COLUMNS), where
+        )
+
+    # Page through rowid ranges so the pooled connection (and its read
+    # transaction) is only held while one chunk is fetched, not while it's written
+    def iter_sales_chunks(self, regions, categories, progress=None, chunk_rows=EXPORT_CHUNK_ROWS):
+        where, params = self._sales_filter(regions, categories)
+        with self.connection() as conn:
+            total = conn.execute(f"SELECT COUNT(*) FROM sales WHERE {where}", params).fetchone()[0]
+        sql = self._sales_page_sql(where)
+        last_rowid = 0
+        done = 0
+        while True:
+            with self.connection() as conn:
+                rows = conn.execute(sql, [last_rowid] + params + [chunk_rows]).fetchall()
+            if not rows:
+                break
+            last_rowid = rows[-1][0]
+            done += len(rows)
+            yield pd.DataFrame.from_records([row[1:] for row in rows], columns=SALES_COLUMNS)
+            if progress is not None:
+                progress(min(done / total, 1.0))
+
+    def supplier_spend(self):
+        return self._query('SELECT * FROM suppliers ORDER BY "Spend (USD)" DESC')
+
+    def supplier_delivery_times(self):
+        return self._query('SELECT "Category", "Delivery Time (days)" FROM suppliers')
+
+    def supplier_metrics(self):
+        return self._query(
+            'SELECT "Supplier", "Category", "Delivery Time (days)", "Defect Rate (%)", "Performance" '
+            'FROM suppliers ORDER BY "Performance"'
+        )
+
+    def supplier_defect_rates(self):
+        return self._query(
+            'SELECT "Category", AVG("Defect Rate (%)") AS "Defect Rate (%)" '
+            'FROM suppliers GROUP BY "Category" ORDER BY "Category"'
+        )
+
+# One SQLite backend and connection pool shared by every session. Without an
+# extract path, a fresh demo database is seeded in a private directory for
+# this process, so its dates are current and nothing else can write to it.
+@st.cache_resource
+def get_sqlite_backend(path):
+    if path:
+        return SQLiteBackend(path, read_only=True)
+
+    demo_dir = tempfile.mkdtemp(prefix="clearvue_demo_")
+    atexit.register(shutil.rmtree, demo_dir, True)
+    backend = SQLiteBackend(os.path.join(demo_dir, "clearvue.db"))
+    backend.seed(generate_sales_data(), generate_supplier_data())
+    return backend
+
+# Pick the storage backend for this run
+if STORAGE_BACKEND == "sqlite":
+    backend = get_sqlite_backend(SQLITE_PATH)
+else:
+    if 'sales_data' not in st.session_state:
+        st.session_state.sales_data = generate_sales_data()
+
+    if 'supplier_data' not in st.session_state:
+        st.session_state.supplier_data = generate_supplier_data()
+
+    backend = PandasBackend(st.session_state.sales_data, st.session_state.supplier_data)
+
 # Dashboard Header
 st.markdown("""
 <div class="header">
@@ -472,39 +1010,10 @@ with tab2:
         """, unsafe_allow_html=True)
 
     with report_col2:
-        # Filter data based on selections
-        filtered_data = st.session_state.sales_data[
-            (st.session_state.sales_data['Region'].isin(region_filter)) &
-            (st.session_state.sales_data['Category'].isin(category_filter))
-        ]
-        
-        # Aggregate data based on report period
-        if report_period == "Daily":
-            period_data = filtered_data.groupby('Date').agg({'Revenue':'sum', 'Units':'sum'}).reset_index()
-            title = "Daily Revenue Trend"
-            x_col = 'Date'
-        elif report_period == "Weekly":
-            filtered_data['Week'] = pd.to_datetime(filtered_data['Date']).dt.strftime('%Y-%U')
-            period_data = filtered_data.groupby('Week').agg({'Revenue':'sum', 'Units':'sum'}).reset_index()
-            title = "Weekly Revenue Trend"
-            x_col = 'Week'
-        elif report_period == "Monthly":
-            filtered_data['Month'] = pd.to_datetime(filtered_data['Date']).dt.strftime('%Y-%m')
-            period_data = filtered_data.groupby('Month').agg({'Revenue':'sum', 'Units':'sum'}).reset_index()
-            title = "Monthly Revenue Trend"
-            x_col = 'Month'
-        elif report_period == "Quarterly":
-            filtered_data['Quarter'] = pd.to_datetime(filtered_data['Date']).dt.quarter
-            filtered_data['Year'] = pd.to_datetime(filtered_data['Date']).dt.year
-            period_data = filtered_data.groupby(['Year', 'Quarter']).agg({'Revenue':'sum', 'Units':'sum'}).reset_index()
-            period_data['Period'] = period_data['Year'].astype(str) + '-Q' + period_data['Quarter'].astype(str)
-            title = "Quarterly Revenue Trend"
-            x_col = 'Period'
-        else:  # Annual
-            filtered_data['Year'] = pd.to_datetime(filtered_data['Date']).dt.year
-            period_data = filtered_data.groupby('Year').agg({'Revenue':'sum', 'Units':'sum'}).reset_index()
-            title = "Annual Revenue Trend"
-            x_col = 'Year'
+        # Aggregate filtered data based on report period
+        period_data = backend.sales_by_period(report_period, region_filter, category_filter)
+        title = f"{report_period} Revenue Trend"
+        x_col = PERIOD_COLUMNS[report_period]
         
         # Create the revenue trend chart
         fig = px.line(
@@ -523,7 +1032,7 @@ with tab2:
         st.plotly_chart(fig, use_container_width=True)
         
         # Regional performance pie chart
-        regional_data = filtered_data.groupby('Region').agg({'Revenue':'sum'}).reset_index()
+        regional_data = backend.sales_by('Region', region_filter, category_filter)
         fig2 = px.pie(
             regional_data,
             names='Region',
@@ -534,7 +1043,7 @@ with tab2:
         st.plotly_chart(fig2, use_container_width=True)
         
         # Category performance
-        category_data = filtered_data.groupby('Category').agg({'Revenue':'sum', 'Units':'sum'}).reset_index()
+        category_data = backend.sales_by('Category', region_filter, category_filter)
         fig3 = px.bar(
             category_data,
             x='Category',
@@ -547,6 +1056,41 @@ with tab2:
         fig3.update_layout(template="plotly_white")
         st.plotly_chart(fig3, use_container_width=True)
 
+    with report_col1:
+        # Export the current filtered rows or report period aggregation
+        st.markdown("#### Export")
+        export_scope = st.radio(
+            "Export Data",
+            ["Filtered Rows", "Report Period Summary"],
+            key="export_scope"
+        )
+        export_format = st.selectbox(
+            "Export Format",
+            list(EXPORT_FORMATS),
+            key="export_format"
+        )
+
+        export_job = st.session_state.get('export_job')
+        export_running = export_job is not None and export_job['status'] in ('queued', 'running')
+        if st.button('Start Export', key='export_button', disabled=export_running):
+            if export_scope == "Filtered Rows":
+                st.session_state.export_job = start_export(
+                    lambda progress: backend.iter_sales_chunks(region_filter, category_filter, progress=progress),
+                    SALES_TEMPLATE, export_format, "sales"
+                )
+            else:
+                st.session_state.export_job = start_export(
+                    lambda progress: iter_export_chunks(period_data, progress=progress),
+                    period_data, export_format, f"{report_period.lower()}_report"
+                )
+            export_job = st.session_state.export_job
+            export_running = True
+
+        if export_running:
+            poll_export_job()
+        elif export_job is not None:
+            show_export_job(export_job)
+
 with tab3:
     # Supplier analytics section
     st.markdown("### Supplier Performance Analytics")
@@ -555,7 +1099,7 @@ with tab3:
     with supplier_col1:
         # Supplier performance summary
         fig3 = px.bar(
-            st.session_state.supplier_data.sort_values('Spend (USD)', ascending=False),
+            backend.supplier_spend(),
             x='Supplier',
             y='Spend (USD)',
             color='Performance',
@@ -578,7 +1122,7 @@ with tab3:
         
         # Delivery time analysis
         fig4 = px.box(
-            st.session_state.supplier_data,
+            backend.supplier_delivery_times(),
             x='Category',
             y='Delivery Time (days)',
             title='Delivery Time by Category',
@@ -591,9 +1135,7 @@ with tab3:
         # Supplier metrics
         st.markdown("#### Key Supplier Metrics")
         st.dataframe(
-            st.session_state.supplier_data[
-                ['Supplier', 'Category', 'Delivery Time (days)', 'Defect Rate (%)', 'Performance']
-            ].sort_values('Performance'),
+            backend.supplier_metrics(),
             height=400,
             use_container_width=True
         )
@@ -612,7 +1154,7 @@ with tab3:
         """, unsafe_allow_html=True)
         
         # Defect rate analysis
-        defect_data = st.session_state.supplier_data.groupby('Category')['Defect Rate (%)'].mean().reset_index()
+        defect_data = backend.supplier_defect_rates()
         fig5 = px.bar(
             defect_data,
             x='Category',
@@ -685,8 +1227,10 @@ st.markdown("""
 
 # Simulate real-time updates
 if st.button('Refresh Data', key='refresh_button'):
-    st.session_state.sales_data = generate_sales_data()
-    st.session_state.supplier_data = generate_supplier_data()
+    # The SQLite database may be a shared extract, so it is only re-queried, never rewritten
+    if STORAGE_BACKEND != "sqlite":
+        st.session_state.sales_data = generate_sales_data()
+        st.session_state.supplier_data = generate_supplier_data()
     st.rerun()
 
 # Update real-time components
@@ -0,0 +1,255 @@
+# ClearVue BI Dashboard load test
+#
+# Runs app.py headlessly with Streamlit's AppTest for a growing number of
+# concurrent simulated sessions, drives a realistic mix of interactions and
+# reports rerun latency percentiles, throughput and process RSS per step.
+#
+# Usage:
+#   pip install -r requirements-dev.txt
+#   python load_test.py --sessions 1 2 4 8 --actions 20 --think-time 0.5
+import argparse
+import contextlib
+import datetime
+import gc
+import math
+import os
+import random
+import resource
+import sys
+import threading
+import time
+from unittest.mock import MagicMock
+
+import streamlit
+from streamlit import config
+from streamlit.runtime import Runtime
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1 import app_test
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+REPORT_PERIODS = ["Daily", "Weekly", "Monthly", "Quarterly", "Annual"]
+REGIONS = ['North', 'South', 'East', 'West']
+CATEGORIES = ['Electronics', 'Furniture', 'Office Supplies', 'Appliances']
+
+# share_app_test_runtime() patches AppTest internals as of this release line
+SUPPORTED_STREAMLIT = "1.48."
+
+# Let many AppTests run at once in this process, like sessions on one server.
+# Each AppTest.run() normally installs its own mock Runtime, script cache and
+# appTest config patch, then tears them down again, which breaks as soon as
+# two runs overlap. Share one of each across all sessions instead.
+def share_app_test_runtime():
+    if not streamlit.__version__.startswith(SUPPORTED_STREAMLIT):
+        sys.exit(
+            f"load_test.py patches Streamlit {SUPPORTED_STREAMLIT}x AppTest internals, "
+            f"but Streamlit {streamlit.__version__} is installed; re-check share_app_test_runtime()"
+        )
+
+    class PerRunRuntime(Runtime):
+        pass
+
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime._instance = runtime
+
+    # AppTest's per-run setup and teardown now land on a throwaway subclass
+    app_test.Runtime = PerRunRuntime
+    script_cache = ScriptCache()
+    app_test.ScriptCache = lambda: script_cache
+    config.set_option("global.appTest", True)
+    app_test.patch_config_options = lambda overrides: contextlib.nullcontext()
+
+# Process memory in MB; without psutil this is the lifetime peak, which never
+# drops between ramp steps (install requirements-dev.txt for current RSS)
+def current_rss_mb():
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+# Nearest-rank percentile of a list of values
+def percentile(values, pct):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+# Simulated interactions; each one prepares the next rerun of the session
+def switch_report_period(at, rng):
+    widget = at.selectbox(key="report_period")
+    widget.set_value(rng.choice([p for p in REPORT_PERIODS if p != widget.value]))
+
+def toggle_region_filter(at, rng):
+    at.multiselect(key="region_filter").set_value(rng.sample(REGIONS, rng.randint(1, len(REGIONS))))
+
+def toggle_category_filter(at, rng):
+    at.multiselect(key="category_filter").set_value(rng.sample(CATEGORIES, rng.randint(1, len(CATEGORIES))))
+
+def press_refresh(at, rng):
+    at.button(key="refresh_button").click()
+
+def wait_for_payment_tick(at, rng):
+    # Backdate the last update instead of sleeping, so the next rerun is a payment tick
+    at.session_state["last_update"] = datetime.datetime.now() - datetime.timedelta(seconds=6)
+
+INTERACTIONS = {
+    "report_period": (switch_report_period, 30),
+    "region_filter": (toggle_region_filter, 25),
+    "category_filter": (toggle_category_filter, 25),
+    "payment_tick": (wait_for_payment_tick, 15),
+    "refresh": (press_refresh, 5),
+}
+
+# Drive one simulated analyst session and record each rerun's latency
+def run_session(seed, args, barrier, results, lock):
+    rng = random.Random(seed)
+    names = list(INTERACTIONS)
+    weights = [INTERACTIONS[name][1] for name in names]
+
+    latencies = []
+    errors = 0
+    started = time.perf_counter()
+    try:
+        at = AppTest.from_file(APP_PATH, default_timeout=args.timeout)
+        at.run()
+        loaded = not at.exception
+    except Exception:
+        loaded = False
+    startup = time.perf_counter() - started
+
+    barrier.wait()
+    for _ in range(args.actions if loaded else 0):
+        name = rng.choices(names, weights)[0]
+        started = time.perf_counter()
+        try:
+            INTERACTIONS[name][0](at, rng)
+            started = time.perf_counter()
+            at.run()
+            if at.exception:
+                errors += 1
+        except Exception:
+            errors += 1
+        latencies.append((name, time.perf_counter() - started))
+        if args.think_time:
+            time.sleep(rng.uniform(0, 2 * args.think_time))
+
+    with lock:
+        results['startup'].append(startup)
+        results['failed_sessions'] += not loaded
+        results['latencies'].extend(latencies)
+        results['errors'] += errors
+
+# Run one step of the ramp with the given number of concurrent sessions
+def run_step(sessions, args):
+    results = {'startup': [], 'latencies': [], 'errors': 0, 'failed_sessions': 0}
+    lock = threading.Lock()
+    # The extra party is this thread, so timing starts once every session has loaded
+    barrier = threading.Barrier(sessions + 1)
+    threads = [
+        threading.Thread(
+            target=run_session,
+            args=(args.seed + sessions * 1000 + i, args, barrier, results, lock),
+            daemon=True
+        )
+        for i in range(sessions)
+    ]
+    for thread in threads:
+        thread.start()
+
+    peak_rss = [current_rss_mb()]
+    done = threading.Event()
+
+    def sample_rss():
+        while not done.wait(0.2):
+            peak_rss.append(current_rss_mb())
+
+    sampler = threading.Thread(target=sample_rss, daemon=True)
+    sampler.start()
+
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    done.set()
+    sampler.join()
+
+    rerun_times = [latency for _, latency in results['latencies']]
+    return {
+        'sessions': sessions,
+        'reruns': len(rerun_times),
+        'errors': results['errors'] + results['failed_sessions'],
+        'startup': sum(results['startup']) / len(results['startup']),
+        'p50': percentile(rerun_times, 50),
+        'p95': percentile(rerun_times, 95),
+        'p99': percentile(rerun_times, 99),
+        'throughput': len(rerun_times) / elapsed if elapsed else float("nan"),
+        'rss': max(peak_rss),
+        'by_action': {
+            name: percentile([latency for action, latency in results['latencies'] if action == name], 95)
+            for name in INTERACTIONS
+        },
+    }
+
+def print_report(steps):
+    rss_label = "RSS MB" if psutil is not None else "Peak RSS MB (lifetime)"
+    rss_width = max(8, len(rss_label))
+    print()
+    print(f"{'Sessions':>8} {'Reruns':>7} {'Errors':>6} {'Startup s':>9} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'Reruns/s':>9} {rss_label:>{rss_width}}")
+    for step in steps:
+        print(f"{step['sessions']:>8} {step['reruns']:>7} {step['errors']:>6} {step['startup']:>9.2f} "
+              f"{step['p50'] * 1000:>8.0f} {step['p95'] * 1000:>8.0f} {step['p99'] * 1000:>8.0f} "
+              f"{step['throughput']:>9.2f} {step['rss']:>{rss_width}.0f}")
+
+    print()
+    print("p95 rerun latency by interaction (ms)")
+    print(f"{'Sessions':>8} " + " ".join(f"{name:>15}" for name in INTERACTIONS))
+    for step in steps:
+        print(f"{step['sessions']:>8} " + " ".join(
+            f"{step['by_action'][name] * 1000:>15.0f}" for name in INTERACTIONS
+        ))
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the ClearVue BI Dashboard with concurrent simulated sessions")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="concurrent session counts to ramp through")
+    parser.add_argument("--actions", type=int, default=20,
+                        help="interactions per session at each step")
+    parser.add_argument("--think-time", type=float, default=0.5,
+                        help="mean pause between interactions, in seconds")
+    parser.add_argument("--timeout", type=float, default=120,
+                        help="maximum seconds a single rerun may take")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    share_app_test_runtime()
+    steps = []
+    for sessions in args.sessions:
+        print(f"Running {sessions} concurrent session(s)...", flush=True)
+        steps.append(run_step(sessions, args))
+        gc.collect()
+
+    print_report(steps)
+    if psutil is None:
+        print()
+        print("psutil is not installed, so RSS is the process's lifetime peak and "
+              "carries over between steps; install requirements-dev.txt for per-step RSS")
+    if any(step['errors'] for step in steps):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
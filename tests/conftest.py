@@ -0,0 +1,18 @@
+import os
+import runpy
+
+import pytest
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+# Run app.py once in Streamlit bare mode (pandas backend) and return its
+# module globals. These are the dict the app's functions actually read, so
+# tests can monkeypatch settings such as EXPORT_DIR in it.
+@pytest.fixture(scope="session")
+def app():
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("CLEARVUE_BACKEND", "pandas")
+        mp.delenv("CLEARVUE_SQLITE_PATH", raising=False)
+        namespace = runpy.run_path(APP_PATH, run_name="clearvue_app")
+    return namespace['generate_sales_data'].__globals__
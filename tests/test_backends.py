@@ -0,0 +1,158 @@
+# Parity tests: the SQLite backend's SQL bucketing and group-bys must give
+# the same results as the pandas backend on the same data
+import random
+import sqlite3
+
+import pandas as pd
+import pytest
+
+REGION_FILTERS = [
+    ['North', 'South', 'East', 'West'],
+    ['North', 'West'],
+    [],
+]
+CATEGORY_FILTERS = [
+    ['Electronics', 'Furniture', 'Office Supplies', 'Appliances'],
+    ['Furniture'],
+    [],
+]
+
+
+@pytest.fixture(scope="module")
+def backends(app, tmp_path_factory):
+    random.seed(0)
+    sales_data = app['generate_sales_data']()
+    supplier_data = app['generate_supplier_data']()
+    sqlite_backend = app['SQLiteBackend'](str(tmp_path_factory.mktemp("db") / "clearvue.db"), pool_size=2)
+    sqlite_backend.seed(sales_data, supplier_data)
+    return app['PandasBackend'](sales_data, supplier_data), sqlite_backend
+
+
+def assert_same(expected, actual):
+    pd.testing.assert_frame_equal(
+        expected.reset_index(drop=True),
+        actual.reset_index(drop=True),
+        check_dtype=False,
+        check_index_type=False,
+    )
+
+
+@pytest.mark.parametrize("report_period", ["Daily", "Weekly", "Monthly", "Quarterly", "Annual"])
+@pytest.mark.parametrize("regions", REGION_FILTERS)
+@pytest.mark.parametrize("categories", CATEGORY_FILTERS)
+def test_sales_by_period(backends, report_period, regions, categories):
+    pandas_backend, sqlite_backend = backends
+    assert_same(
+        pandas_backend.sales_by_period(report_period, regions, categories),
+        sqlite_backend.sales_by_period(report_period, regions, categories),
+    )
+
+
+@pytest.mark.parametrize("column", ["Region", "Category"])
+@pytest.mark.parametrize("regions", REGION_FILTERS)
+def test_sales_by(backends, column, regions):
+    pandas_backend, sqlite_backend = backends
+    assert_same(
+        pandas_backend.sales_by(column, regions, ['Furniture', 'Appliances']),
+        sqlite_backend.sales_by(column, regions, ['Furniture', 'Appliances']),
+    )
+
+
+@pytest.mark.parametrize("regions", REGION_FILTERS)
+def test_iter_sales_chunks(backends, regions):
+    pandas_backend, sqlite_backend = backends
+    chunks = {}
+    for name, backend in zip(("pandas", "sqlite"), backends):
+        progress = []
+        chunks[name] = list(backend.iter_sales_chunks(regions, ['Electronics'], progress=progress.append, chunk_rows=5000))
+        assert all(len(chunk) <= 5000 for chunk in chunks[name])
+        if progress:
+            assert progress[-1] == 1.0
+    if not chunks["pandas"]:
+        assert not chunks["sqlite"]
+        return
+    assert_same(pd.concat(chunks["pandas"]), pd.concat(chunks["sqlite"]))
+
+
+def test_supplier_queries(backends):
+    pandas_backend, sqlite_backend = backends
+    assert_same(pandas_backend.supplier_defect_rates(), sqlite_backend.supplier_defect_rates())
+    assert_same(
+        pandas_backend.supplier_delivery_times().sort_values(['Category', 'Delivery Time (days)']),
+        sqlite_backend.supplier_delivery_times().sort_values(['Category', 'Delivery Time (days)']),
+    )
+    # Tie order differs between backends, so compare on a deterministic key
+    spend_key = ['Spend (USD)', 'Supplier', 'Category']
+    assert_same(
+        pandas_backend.supplier_spend().sort_values(spend_key, ascending=[False, True, True]),
+        sqlite_backend.supplier_spend().sort_values(spend_key, ascending=[False, True, True]),
+    )
+    metrics_key = ['Performance', 'Supplier', 'Category']
+    assert_same(
+        pandas_backend.supplier_metrics().sort_values(metrics_key),
+        sqlite_backend.supplier_metrics().sort_values(metrics_key),
+    )
+
+
+def test_export_releases_connection_between_chunks(app, backends, tmp_path):
+    sales_data = backends[0].sales_data
+    backend = app['SQLiteBackend'](str(tmp_path / "single.db"), pool_size=1)
+    backend.seed(sales_data, backends[0].supplier_data)
+    chunks = backend.iter_sales_chunks(['North'], ['Furniture'], chunk_rows=100)
+    next(chunks)
+    # With a single pooled connection this would block if the export still held it
+    assert not backend.sales_by('Region', ['North'], ['Furniture']).empty
+    assert next(chunks) is not None
+
+
+def test_pool_timeout(app, tmp_path):
+    backend = app['SQLiteBackend'](str(tmp_path / "pool.db"), pool_size=1, pool_timeout=0.1)
+    with backend.connection():
+        with pytest.raises(TimeoutError, match="CLEARVUE_SQLITE_POOL_SIZE"):
+            with backend.connection():
+                pass
+
+
+def test_export_pages_scan_by_rowid(backends):
+    sqlite_backend = backends[1]
+    where, params = sqlite_backend._sales_filter(['North'], ['Furniture'])
+    with sqlite_backend.connection() as conn:
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN " + sqlite_backend._sales_page_sql(where), [0] + params + [100]
+        ).fetchall()
+    details = " ".join(row[-1] for row in plan)
+    assert "INTEGER PRIMARY KEY" in details
+    assert "TEMP B-TREE" not in details
+
+
+@pytest.fixture
+def extract_path(app, backends, tmp_path):
+    path = tmp_path / "extract.db"
+    writer = app['SQLiteBackend'](str(path), pool_size=1)
+    writer.seed(backends[0].sales_data, backends[0].supplier_data)
+    with writer.connection() as conn:
+        conn.execute("PRAGMA journal_mode=DELETE")
+    return path
+
+
+def test_extract_opens_read_only(app, backends, extract_path):
+    before = extract_path.read_bytes()
+    extract_path.chmod(0o444)
+    backend = app['SQLiteBackend'](str(extract_path), pool_size=1, read_only=True)
+    assert_same(
+        backends[0].sales_by('Region', ['North'], ['Furniture']),
+        backend.sales_by('Region', ['North'], ['Furniture']),
+    )
+    with pytest.raises(ValueError, match="read-only"):
+        backend.seed(backends[0].sales_data, backends[0].supplier_data)
+    with backend.connection() as conn, pytest.raises(sqlite3.OperationalError):
+        conn.execute("DELETE FROM sales")
+    assert extract_path.read_bytes() == before
+
+
+def test_extract_schema_is_checked(app, tmp_path):
+    path = tmp_path / "bad.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute('CREATE TABLE sales ("Date" TEXT, "Region" TEXT)')
+    with pytest.raises(ValueError, match="missing columns"):
+        app['SQLiteBackend'](str(path), pool_size=1, read_only=True)
@@ -0,0 +1,141 @@
+# Behaviour tests for the chunked export writers and export jobs
+import os
+import time
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+from openpyxl import load_workbook
+
+FORMATS = {"CSV": ".csv", "Parquet": ".parquet", "Excel": ".xlsx"}
+
+
+@pytest.fixture
+def sales(app):
+    return app['generate_sales_data']().head(25)
+
+
+def read_part(path):
+    if path.endswith(".csv"):
+        return pd.read_csv(path)
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.concat(pd.read_excel(path, sheet_name=None).values())
+
+
+def write(app, export_format, chunks, template, tmp_path):
+    extension, writer = app['EXPORT_FORMATS'][export_format]
+    paths = []
+
+    def part_path(number):
+        paths.append(str(tmp_path / f"export_part{number}{extension}"))
+        return paths[-1]
+
+    writer(chunks, part_path, template)
+    return paths
+
+
+def new_job(export_format):
+    return {
+        'format': export_format,
+        'stored_name': f"abc_clearvue_sales{FORMATS[export_format]}",
+        'parts': [],
+        'status': 'queued',
+        'progress': 0.0,
+        'rows_written': 0,
+        'error': None,
+    }
+
+
+@pytest.mark.parametrize("export_format", FORMATS)
+def test_round_trip(app, sales, tmp_path, export_format):
+    chunks = app['iter_export_chunks'](sales, chunk_rows=10)
+    paths = write(app, export_format, chunks, sales.iloc[0:0], tmp_path)
+    assert len(paths) == 1
+    pd.testing.assert_frame_equal(read_part(paths[0]).reset_index(drop=True), sales.reset_index(drop=True))
+
+
+@pytest.mark.parametrize("export_format", FORMATS)
+def test_empty_export_keeps_header(app, sales, tmp_path, export_format):
+    paths = write(app, export_format, iter([]), sales.iloc[0:0], tmp_path)
+    assert list(read_part(paths[0]).columns) == list(sales.columns)
+
+
+def test_empty_parquet_keeps_schema(app, sales, tmp_path):
+    (tmp_path / "empty").mkdir()
+    empty = write(app, "Parquet", iter([]), app['SALES_TEMPLATE'], tmp_path / "empty")
+    full = write(app, "Parquet", iter([sales]), app['SALES_TEMPLATE'], tmp_path)
+    assert pq.read_schema(empty[0]).types == pq.read_schema(full[0]).types
+
+
+def test_csv_header_is_quoted(app, tmp_path):
+    data = pd.DataFrame({'Revenue, USD': [1.5, 2.5], 'Units': [1, 2]})
+    paths = write(app, "CSV", iter([data]), data.iloc[0:0], tmp_path)
+    pd.testing.assert_frame_equal(pd.read_csv(paths[0]), data)
+
+
+def test_excel_rolls_over_sheets_and_parts(app, sales, tmp_path, monkeypatch):
+    monkeypatch.setitem(app, 'EXCEL_MAX_ROWS', 4)
+    monkeypatch.setitem(app, 'EXCEL_SHEETS_PER_PART', 2)
+    chunks = app['iter_export_chunks'](sales.head(10), chunk_rows=3)
+    paths = write(app, "Excel", chunks, sales.iloc[0:0], tmp_path)
+
+    assert [load_workbook(path, read_only=True).sheetnames for path in paths] == [
+        ["Export 1", "Export 2"], ["Export 1"]
+    ]
+    rows = pd.concat(read_part(path) for path in paths)
+    pd.testing.assert_frame_equal(rows.reset_index(drop=True), sales.head(10).reset_index(drop=True))
+
+
+@pytest.mark.parametrize("export_format", ["CSV", "Parquet"])
+def test_parts_split_at_size_limit(app, sales, tmp_path, monkeypatch, export_format):
+    monkeypatch.setitem(app, 'EXPORT_PART_MAX_BYTES', 500)
+    chunks = app['iter_export_chunks'](sales, chunk_rows=5)
+    paths = write(app, export_format, chunks, sales.iloc[0:0], tmp_path)
+
+    assert len(paths) > 1
+    if export_format == "CSV":
+        assert all(os.path.getsize(path) <= 500 for path in paths)
+    rows = pd.concat(read_part(path) for path in paths)
+    pd.testing.assert_frame_equal(rows.reset_index(drop=True), sales.reset_index(drop=True))
+
+
+def test_run_export_single_part_keeps_plain_name(app, sales, tmp_path, monkeypatch):
+    monkeypatch.setitem(app, 'EXPORT_DIR', str(tmp_path))
+    job = new_job("CSV")
+    app['run_export'](job, lambda progress: app['iter_export_chunks'](sales, progress=progress), sales)
+
+    assert job['status'] == 'done'
+    assert job['rows_written'] == len(sales)
+    assert job['progress'] == 1.0
+    assert job['parts'] == [str(tmp_path / job['stored_name'])]
+    assert os.listdir(tmp_path) == [job['stored_name']]
+
+
+def test_run_export_failure_removes_parts(app, sales, tmp_path, monkeypatch):
+    monkeypatch.setitem(app, 'EXPORT_DIR', str(tmp_path))
+
+    def failing_chunks(progress):
+        yield sales
+        raise RuntimeError("database went away")
+
+    job = new_job("Parquet")
+    app['run_export'](job, failing_chunks, sales.iloc[0:0])
+
+    assert job['status'] == 'failed'
+    assert job['error'] == "database went away"
+    assert os.listdir(tmp_path) == []
+
+
+def test_sweep_export_dir_removes_expired_files(app, tmp_path, monkeypatch):
+    monkeypatch.setitem(app, 'EXPORT_DIR', str(tmp_path))
+    expired = tmp_path / "expired.csv"
+    fresh = tmp_path / "fresh.csv"
+    expired.write_text("a\n")
+    fresh.write_text("a\n")
+    old = time.time() - (app['EXPORT_MAX_AGE_HOURS'] + 1) * 3600
+    os.utime(expired, (old, old))
+
+    app['sweep_export_dir']()
+
+    assert os.listdir(tmp_path) == ["fresh.csv"]